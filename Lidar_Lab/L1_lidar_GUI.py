@@ -14,63 +14,144 @@ sudo ip addr add 168.254.15.100/16 dev eth0
 sudo ip link set eth0 up
 ping 168.254.15.1
 
+For the lowest jitter, pin the NIC's IRQ to the same CPU as the reader
+thread (see /proc/interrupts, then write a CPU mask to
+/proc/irq/<n>/smp_affinity).
+
 USB quick notes:
 ----------------
 - No need to specify /dev/tty*: USB handled by L1_lidar_usb (serial or bulk)
 - If permissions block access, add a udev rule or run with sudo as a fallback
+
+Optional speedups:
+------------------
+pip3 install numba    # JIT-compiled scan parser (preferred)
+pip3 install cython   # compiled _lidar_fast.pyx parser when Numba is missing
+Without either, scans are parsed with plain NumPy.
 """
 
 import socket
+import sys
 import numpy as np
 import time
 import threading
 import collections
 import tkinter as tk
 from matplotlib.figure import Figure
+from matplotlib.animation import FuncAnimation
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from L1_lidar_usb import Lidar as UsbLidar
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except Exception:
+    HAVE_NUMBA = False
+HAVE_CYTHON = False
+if not HAVE_NUMBA:
+    # Fall back to the Cython parser (_lidar_fast.pyx), compiled on first import
+    try:
+        import pyximport
+    except Exception:
+        pyximport = None
+    if pyximport is not None:
+        _pyx_hooks = pyximport.install(language_level=3)
+        try:
+            from _lidar_fast import parse_scan as _cy_parse_scan
+            HAVE_CYTHON = True
+        except Exception:
+            # Build failed (e.g. no C compiler): don't leave the hooks on sys.meta_path
+            pyximport.uninstall(*_pyx_hooks)
 
 # ========== CONFIGURATION ==========
 # Ethernet settings
 SENSOR_IP = "168.254.15.1"
 SENSOR_PORT = 2112
+MAX_DATAGRAM = 12000       # bytes; upper bound for one telegram (0.33° with RSSI is ~9 KB)
+RECV_SIZE = 16384          # bytes per read; > MAX_DATAGRAM so one read can drain a whole scan
+SOCKET_RCVBUF = 256 * 1024  # kernel receive buffer
+BUSY_POLL_US = 50          # SO_BUSY_POLL budget (µs) in 50 Hz mode, Linux only
+SO_BUSY_POLL = getattr(socket, 'SO_BUSY_POLL', 46)  # not exported by the socket module
 
 # Angular resolution settings
 # TiM561 supports: 0.33° (810 points), 0.5° (540 points), or 1.0° (270 points)
 # Options: '0.33', '0.5', or '1.0'
 ANGULAR_RESOLUTION = '1.0'  # Default: 0.33° for maximum resolution
+
+# Plot settings
+MAX_RANGE = 10.0  # meters, TiM561 working range
+MAX_PLOT_POINTS = 360  # bearings drawn per scan; more are not distinguishable at 6x6 in
 # ================================================== #
 
 STX, ETX = b'\x02', b'\x03'
+MAX_POINTS = 811  # 0.33° resolution yields the longest scan
 
+# Prebuilt mLMPsetscancfg telegrams per angular resolution (frequency code +1/+2/+3)
+_SCANCFG = {
+    '0.33': b'\x02sMN mLMPsetscancfg +1 +1 -450000 +2250000\x03\0',  # 0.33° = 15 Hz
+    '0.5': b'\x02sMN mLMPsetscancfg +2 +1 -450000 +2250000\x03\0',   # 0.5° = 25 Hz
+    '1.0': b'\x02sMN mLMPsetscancfg +3 +1 -450000 +2250000\x03\0',   # 1.0° = 50 Hz
+}
 
-# --- LiDAR Helper Functions --- #
-def bytes_from_stream(stream, is_socket=True):
-    """Yield bytes from the stream (socket or serial)."""
-    while True:
-        if is_socket:
-            data = stream.recv(256)
-        else:
-            data = stream.read(256)
-        for b in data:
-            yield bytes([b])
+# ASCII -> hex digit value lookup (-1 for anything that is not a hex digit)
+HEX = np.full(256, -1, np.int8)
+HEX[ord('0'):ord('9') + 1] = range(10)
+HEX[ord('a'):ord('f') + 1] = range(10, 16)
+HEX[ord('A'):ord('F') + 1] = range(10, 16)
 
 
-def datagrams_from_stream(stream, is_socket=True):
-    """Generate datagrams starting with STX and ending with ETX."""
-    byte_gen = bytes_from_stream(stream, is_socket)
+# --- LiDAR Helper Functions --- #
+def datagrams_from_stream(stream, is_socket=True, latest_only=False, quickack=False):
+    """Generate datagrams starting with STX and ending with ETX.
+
+    Reads into a persistent buffer and slices whole datagrams out with
+    bytes.find instead of iterating the stream one byte at a time. With
+    latest_only, datagrams that are already superseded by a newer complete
+    one in the buffer are dropped unparsed, so a lagging reader catches up.
+
+    Read timeouts are retried; any other socket error propagates, and a
+    socket closed by the sensor raises ConnectionError. With quickack (Linux sockets), TCP_QUICKACK is re-armed
+    after every read, since the kernel clears it again on its own.
+    """
+    buf = bytearray()
+    chunk = bytearray(RECV_SIZE)
+    view = memoryview(chunk)
+    read_into = stream.recv_into if is_socket else stream.readinto
     while True:
-        datagram = b''
-        # Find STX
-        for b in byte_gen:
-            if b == STX:
-                break
-        # Read until ETX
-        for b in byte_gen:
-            if b == ETX:
-                break
-            datagram += b
-        yield datagram
+        start = buf.find(STX)
+        if start < 0:
+            buf.clear()  # nothing before an STX is worth keeping
+        else:
+            end = buf.find(ETX, start + 1)
+            if end >= 0:
+                # If an earlier ETX was lost, the datagram starts at the last STX before this ETX
+                start = buf.rfind(STX, start, end)
+                if latest_only:
+                    last_end = buf.rfind(ETX)
+                    last_start = buf.rfind(STX, end + 1, last_end)
+                    if last_start >= 0:
+                        start, end = last_start, last_end
+                yield bytes(buf[start + 1:end])
+                del buf[:end + 1]
+                continue
+            if start:
+                del buf[:start]
+            if len(buf) > MAX_DATAGRAM:
+                # ETX was lost; keep only what follows the newest STX
+                last = buf.rfind(STX, 1)
+                if last > 0:
+                    del buf[:last]
+                else:
+                    buf.clear()
+        try:
+            n = read_into(chunk)
+        except socket.timeout:
+            continue
+        if n:
+            buf += view[:n]
+            if quickack:
+                stream.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        elif is_socket:
+            raise ConnectionError("sensor closed the connection")
 
 
 def parse_number(n):
@@ -81,16 +162,118 @@ def parse_number(n):
         return int(n)
 
 
-def decode_datagram(datagram):
+def parse_scan_data(payload, count, out):
+    """Parse `count` space-separated hex distances (mm) from payload into out (m).
+
+    Vectorized over the whole payload: each hex digit is weighted by its
+    position from the end of its token and the tokens are summed with
+    np.add.reduceat. Returns the filled slice of out, or None if malformed.
+    """
+    arr = np.frombuffer(payload, dtype=np.uint8)
+    spaces = np.flatnonzero(arr == 0x20)
+    if len(spaces) >= count:
+        end = spaces[count - 1]
+    elif len(spaces) == count - 1:
+        end = len(arr)
+    else:
+        return None
+    arr = arr[:end]
+    spaces = spaces[:count - 1]
+    # Reject empty tokens (leading, doubled or trailing spaces) like the compiled parsers do
+    if np.any(np.diff(spaces, prepend=-1, append=end) == 1):
+        return None
+
+    digits = HEX[arr].astype(np.int32)
+    is_space = np.zeros(end, dtype=bool)
+    is_space[spaces] = True
+    if np.any(digits[~is_space] < 0):
+        return None
+    digits[is_space] = 0
+
+    token = np.cumsum(is_space)
+    token_end = np.append(spaces, end)
+    shift = (token_end[token] - 1 - np.arange(end)) * 4
+    starts = np.insert(spaces + 1, 0, 0)
+    values = np.add.reduceat(digits << shift, starts)
+
+    np.multiply(values, 0.001, out=out[:count], casting='unsafe')
+    return out[:count]
+
+
+if HAVE_NUMBA:
+    @njit(nogil=True, cache=True, boundscheck=False)
+    def parse_scan(buf, start, count, out):
+        """Compiled equivalent of parse_scan_data over a uint8 view of the datagram.
+
+        Walks the tokens from buf[start] and returns how many were written
+        to out, or -1 on a malformed token or more tokens than out can hold.
+        """
+        n = 0
+        val = 0
+        digits = 0
+        size = len(out)  # bounds checks are off: never write past out
+        for pos in range(start, len(buf)):
+            c = buf[pos]
+            if c == 0x20:
+                if digits == 0 or n == size:
+                    return -1
+                out[n] = val * 0.001
+                n += 1
+                if n == count:
+                    return n
+                val = 0
+                digits = 0
+            else:
+                d = HEX[c]
+                if d < 0:
+                    return -1
+                val = val * 16 + d
+                digits += 1
+        if digits:
+            if n == size:
+                return -1
+            out[n] = val * 0.001
+            n += 1
+        return n
+elif HAVE_CYTHON:
+    parse_scan = _cy_parse_scan
+
+
+def _nth_space(buf, n):
+    """Return the index of the n-th space in buf, or -1 if there are fewer."""
+    i = -1
+    for _ in range(n):
+        i = buf.find(b' ', i + 1)
+        if i < 0:
+            break
+    return i
+
+
+def decode_datagram(datagram, out=None):
     """Extract scan data from the LiDAR datagram."""
     try:
-        items = datagram.split(b' ')
-        if items[0] != b'sSN' or items[1] != b'LMDscandata':
+        if not datagram.startswith(b'sSN LMDscandata '):
+            return None
+
+        # Token 25 holds the number of data points; the distances follow it.
+        # Locate it directly rather than splitting the whole telegram.
+        i25 = _nth_space(datagram, 25)
+        i26 = datagram.find(b' ', i25 + 1) if i25 >= 0 else -1
+        if i26 < 0:
             return None
 
-        num_data = parse_number(items[25])
-        data = [parse_number(x) / 1000 for x in items[26:26 + num_data]]
-        return np.array(data)
+        num_data = parse_number(datagram[i25 + 1:i26])
+        if num_data <= 0:
+            return None
+        if out is None:
+            out = np.empty(num_data, dtype=np.float32)
+        elif num_data > len(out):
+            return None
+
+        if HAVE_NUMBA or HAVE_CYTHON:
+            n = parse_scan(np.frombuffer(datagram, dtype=np.uint8), i26 + 1, num_data, out)
+            return out[:n] if n == num_data else None
+        return parse_scan_data(memoryview(datagram)[i26 + 1:], num_data, out)
     except Exception:
         return None
 
@@ -103,27 +286,27 @@ class Lidar:
         self.tcp_port = tcp_port
         self.angular_resolution = angular_resolution
         self.stop_flag = False
-        self.ds = None
+        # Double-buffered scan storage: decode into the back buffer, then flip _idx.
+        # The old front buffer is rewritten right after the next flip, so readers
+        # must copy and re-check _seq (seqlock): ds does this, _front is the raw view.
+        self._bufs = (np.empty(MAX_POINTS, dtype=np.float32), np.empty(MAX_POINTS, dtype=np.float32))
+        self._idx = 0  # buffer holding the latest scan
+        self._n = 0    # number of points in the latest scan
+        self._seq = 0  # bumped on every published scan so readers can skip repeats
+        # Beam angles (radians) for each scan length the TiM561 produces (1.0°, 0.5°, 0.33°)
+        self._angles_cache = {n: np.linspace(-np.pi * 3 / 4, np.pi * 3 / 4, n, dtype=np.float32)
+                              for n in (271, 541, 811)}
         self.connection = None  # Will be socket or serial object
         self.datagrams_generator = None
         # USB implementation (delegates to L1_lidar_usb)
         self._usb_impl = None
         self._usb_proc = None
+        self._new_frame = threading.Event()  # set by the USB reader for each new scan
 
     def _set_angular_resolution(self):
         """Set the angular resolution of the LiDAR."""
-        # Map angular resolution to frequency code
-        resolution_map = {
-            '0.33': '1',  # 0.33° = 15 Hz
-            '0.5': '2',   # 0.5° = 25 Hz
-            '1.0': '3'    # 1.0° = 50 Hz
-        }
-        
-        freq_code = resolution_map.get(self.angular_resolution, '1')
-        cmd = f'\x02sMN mLMPsetscancfg +{freq_code} +1 -450000 +2250000\x03\0'.encode()
-        
         if self.mode == 'ethernet':
-            self.connection.send(cmd)
+            self.connection.send(_SCANCFG.get(self.angular_resolution, _SCANCFG['0.33']))
         else:
             # USB handled by underlying implementation
             pass
@@ -131,26 +314,49 @@ class Lidar:
         time.sleep(0.2)
         print(f"[+] Set angular resolution to {self.angular_resolution}°")
 
+    def _tune_socket(self):
+        """Disable Nagle, enlarge the receive buffer and (50 Hz) enable busy polling."""
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF)
+        if self.angular_resolution == '1.0' and sys.platform.startswith('linux'):
+            # 50 Hz leaves only 20 ms between scans; busy-poll the NIC briefly on reads
+            try:
+                self.connection.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL, BUSY_POLL_US)
+            except OSError:
+                pass  # best effort: most kernels require CAP_NET_ADMIN
+
     def connect(self):
         """Connect to LiDAR via Ethernet (socket) or USB (L1_lidar_usb)."""
         try:
             if self.mode == 'ethernet':
                 # Connect via TCP/IP socket
                 self.connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                self._tune_socket()
                 self.connection.settimeout(5)
                 self.connection.connect((self.ip, self.tcp_port))
                 print(f"[+] Connected to LiDAR via Ethernet at {self.ip}:{self.tcp_port}")
+
+                # Quick-ACK only sticks on a connected socket, and only until the
+                # kernel drops back to delayed ACKs; the reader re-arms it per read.
+                quickack = hasattr(socket, 'TCP_QUICKACK')  # Linux only
+                if quickack:
+                    self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+
+                # Compile the parse kernel now rather than on the first scan
+                if HAVE_NUMBA:
+                    parse_scan(np.frombuffer(b'0 0', dtype=np.uint8), 0, 2, self._bufs[0])
                 
                 # Set angular resolution
                 self._set_angular_resolution()
                 
                 # Activate data streaming
                 self.connection.send(b'\x02sEN LMDscandata 1\x03\0')
-                self.datagrams_generator = datagrams_from_stream(self.connection, is_socket=True)
+                self.datagrams_generator = datagrams_from_stream(self.connection, is_socket=True, latest_only=True,
+                                                                 quickack=quickack)
                 
             elif self.mode == 'usb':
                 # Delegate USB to shared implementation (serial or USB bulk)
-                self._usb_impl = UsbLidar(angular_resolution=self.angular_resolution)
+                self._usb_impl = UsbLidar(angular_resolution=self.angular_resolution, on_frame=self._new_frame.set)
                 self._usb_impl.connect()
                 print("[+] Connected to LiDAR via USB (L1_lidar_usb)")
             else:
@@ -159,28 +365,72 @@ class Lidar:
         except Exception as e:
             print(f"[!] Connection error: {e}")
 
+    def _angles_for(self, n):
+        """Return the cached beam angles for a scan of n points."""
+        angles = self._angles_cache.get(n)
+        if angles is None:
+            angles = self._angles_cache[n] = np.linspace(-np.pi * 3 / 4, np.pi * 3 / 4, n, dtype=np.float32)
+        return angles
+
+    def _front(self):
+        """Return (seq, zero-copy view of the latest scan), the view being None before the first scan.
+
+        The view is overwritten once the scan after it is published; copy out
+        of it and compare against _seq afterwards, discarding the copy if it moved.
+        """
+        seq = self._seq
+        idx, n = self._idx, self._n
+        return seq, (self._bufs[idx][:n] if n else None)
+
+    @property
+    def ds(self):
+        """Copy of the latest scan distances in meters, or None before the first scan."""
+        while True:
+            seq, view = self._front()
+            if view is None:
+                return None
+            scan = view.copy()
+            if self._seq == seq:
+                return scan
+
+    def _publish(self, n):
+        """Flip the back buffer (holding n fresh points) to the front."""
+        self._n = n
+        self._idx ^= 1
+        self._seq += 1
+
     def run(self):
         """Read continuous data from LiDAR."""
         print("[*] Starting LiDAR stream...")
         if self.mode == 'ethernet':
-            while not self.stop_flag:
-                try:
-                    datagram = next(self.datagrams_generator)
-                    decoded = decode_datagram(datagram)
+            if self.datagrams_generator is None:
+                print("[!] LiDAR not connected")
+                return
+            try:
+                for datagram in self.datagrams_generator:
+                    if self.stop_flag:
+                        break
+                    decoded = decode_datagram(datagram, self._bufs[self._idx ^ 1])
                     if decoded is not None:
-                        self.ds = decoded
-                except Exception:
-                    time.sleep(0.01)
+                        self._publish(len(decoded))
+            except OSError as e:
+                # stop() closes the socket under the reader; anything else is a real failure
+                if not self.stop_flag:
+                    print(f"[!] LiDAR read error: {e}")
         else:
+            if self._usb_impl is None:
+                print("[!] LiDAR not connected")
+                return
             # Start underlying USB reader and bridge ds
             self._usb_proc = self._usb_impl.run()
             while not self.stop_flag:
-                try:
-                    if self._usb_impl.ds is not None:
-                        self.ds = self._usb_impl.ds
-                    time.sleep(0.02)
-                except Exception:
-                    time.sleep(0.02)
+                if not self._new_frame.wait(timeout=0.5):
+                    continue
+                self._new_frame.clear()
+                ds = self._usb_impl.ds
+                n = min(len(ds), MAX_POINTS)
+                self._bufs[self._idx ^ 1][:n] = ds[:n]
+                self._publish(n)
         print("[*] LiDAR stream stopped")
 
     def stop(self):
@@ -213,29 +463,42 @@ class LidarGUI:
         self.ax.set_theta_zero_location('N')
         self.ax.set_theta_direction(-1)
         self.ax.set_thetalim(-np.pi * 3 / 4, np.pi * 3 / 4)
-        self.ax.set_title("Live LiDAR Scan", va='bottom')
+        self.ax.set_rmax(MAX_RANGE)  # fixed once; points past it are dropped in _animate
+        self.ax.set_title("SICK TiM561 Live 270° Scan", va='bottom')
 
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.root)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
-        self.scatter = None
-        self.update_plot()
-
-    def update_plot(self):
-        """Update polar plot with latest LiDAR scan."""
-        if self.lidar.ds is not None:
-            angles = np.linspace(-135, 135, len(self.lidar.ds)) * np.pi / 180
-            distances = self.lidar.ds
-
-            self.ax.clear()
-            self.ax.set_theta_zero_location('N')
-            self.ax.set_theta_direction(-1)
-            self.ax.set_thetalim(-np.pi * 3 / 4, np.pi * 3 / 4)
-            self.ax.scatter(angles, distances, s=5, c='cyan')
-            self.ax.set_title("SICK TiM561 Live 270° Scan", va='bottom')
-            self.canvas.draw()
-
-        self.root.after(100, self.update_plot)  # refresh every 100ms
+        # One scatter artist for the lifetime of the window; _animate only swaps its offsets.
+        # It is animated so blitting redraws it over a cached grid/title background.
+        self.scatter = self.ax.scatter([], [], s=5, c='cyan', animated=True)
+        self._offsets = np.empty((MAX_POINTS, 2), dtype=np.float32)
+        self._last_seq = 0
+        self.anim = FuncAnimation(self.fig, self._animate, interval=100, blit=True, cache_frame_data=False)
+
+    def _animate(self, _frame):
+        """Update polar plot with latest LiDAR scan (FuncAnimation callback, every 100ms)."""
+        # Blitting must still be handed the artist, but a repeat scan needs no new offsets
+        seq, distances = self.lidar._front()
+        if seq == self._last_seq:
+            return [self.scatter]
+
+        if distances is not None:
+            n = len(distances)
+            # Draw every stride-th beam; lidar.ds itself stays at full resolution
+            stride = -(-n // MAX_PLOT_POINTS)
+            angles = self.lidar._angles_for(n)[::stride]
+            distances = distances[::stride]
+            # Only plot real returns inside the plotted range (0 means no echo)
+            valid = (distances > 0) & (distances <= MAX_RANGE)
+            offsets = self._offsets[:np.count_nonzero(valid)]
+            offsets[:, 0] = angles[valid]
+            offsets[:, 1] = distances[valid]
+            if self.lidar._seq != seq:
+                return [self.scatter]  # buffer reused mid-copy; take the next scan instead
+            self.scatter.set_offsets(offsets)
+        self._last_seq = seq
+        return [self.scatter]
 
     def run(self):
         """Run the GUI main loop."""
@@ -130,12 +130,13 @@ def threaded(fn):
 
 
 class Lidar():
-    def __init__(self, port: str | None = None, angular_resolution: str = ANGULAR_RESOLUTION):
+    def __init__(self, port: str | None = None, angular_resolution: str = ANGULAR_RESOLUTION, on_frame=None):
         self.port = port or find_serial_port()
         self.angular_resolution = angular_resolution
         self.stop = False
 
         self.ds = None  # latest distances
+        self.on_frame = on_frame  # optional callback, invoked after each ds update
         self.datagrams_generator = None
         self.usb = None  # PyUSB connection when serial is not present
         self._usb_buffer = b''
@@ -352,7 +353,9 @@ class Lidar():
                     datagram = next(self.datagrams_generator)
                     decoded = decode_datagram(datagram)
                     if decoded is not None:
-                        self.ds = np.array(decoded['Data'])
+                        self.ds = np.array(decoded['Data'], dtype=np.float32)
+                        if self.on_frame is not None:
+                            self.on_frame()
                 except Exception:
                     time.sleep(0.01)
         else:
@@ -372,7 +375,9 @@ class Lidar():
                             self._usb_buffer = self._usb_buffer[e+1:]
                             decoded = decode_datagram(dg)
                             if decoded is not None:
-                                self.ds = np.array(decoded['Data'])
+                                self.ds = np.array(decoded['Data'], dtype=np.float32)
+                                if self.on_frame is not None:
+                                    self.on_frame()
                         else:
                             break
                 except Exception:
@@ -0,0 +1,69 @@
+# cython: boundscheck=False, wraparound=False, language_level=3
+"""
+_lidar_fast.pyx — compiled scan parser for L1_lidar_GUI.py
+
+Cython build of the LMDscandata distance parser, used when Numba is not
+installed. L1_lidar_GUI.py compiles it on import through pyximport and
+falls back to the NumPy parser if that fails (no Cython or no C compiler).
+"""
+
+cdef signed char HEX[256]
+
+
+cdef void _init_hex():
+    cdef int c
+    for c in range(256):
+        HEX[c] = -1
+    for c in range(10):
+        HEX[ord('0') + c] = c
+    for c in range(6):
+        HEX[ord('a') + c] = 10 + c
+        HEX[ord('A') + c] = 10 + c
+
+
+_init_hex()
+
+
+cdef Py_ssize_t _parse_scan(const unsigned char[:] buf, Py_ssize_t start, Py_ssize_t count,
+                            float[:] out) noexcept nogil:
+    cdef Py_ssize_t pos, n = 0, size = buf.shape[0]
+    cdef long val = 0
+    cdef int digits = 0
+    cdef signed char d
+    cdef unsigned char c
+
+    for pos in range(start, size):
+        c = buf[pos]
+        if c == 0x20:
+            if digits == 0:
+                return -1
+            out[n] = val * 0.001
+            n += 1
+            if n == count:
+                return n
+            val = 0
+            digits = 0
+        else:
+            d = HEX[c]
+            if d < 0:
+                return -1
+            val = val * 16 + d
+            digits += 1
+    if digits:
+        out[n] = val * 0.001
+        n += 1
+    return n
+
+
+def parse_scan(const unsigned char[:] buf, Py_ssize_t start, Py_ssize_t count, float[:] out):
+    """Parse `count` space-separated hex distances (mm) from buf[start:] into out (m).
+
+    Same contract as the Numba kernel: returns how many values were written,
+    or -1 on a malformed token. The GIL is released while parsing.
+    """
+    cdef Py_ssize_t n
+    if count <= 0 or count > out.shape[0]:
+        return -1
+    with nogil:
+        n = _parse_scan(buf, start, count, out)
+    return n